@@ -1,16 +1,68 @@
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Dict, Any
+import asyncio
+import hashlib
+import httpx
+import logging
 import openai
+import orjson
 import os
+import queue
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from dotenv import load_dotenv
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 
 # Load environment variables
 load_dotenv()
 
-app = FastAPI(title="Analytics Agent", version="1.0.0")
+# Async-safe logging: request coroutines only enqueue records; a
+# background listener thread does the actual stream writes so the event
+# loop never blocks on a stdout flush.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+logger = logging.getLogger("analytics_agent")
+if not logger.handlers:
+    logger.setLevel(logging.INFO)
+    logger.addHandler(QueueHandler(_log_queue))
+    logger.propagate = False
+    _log_listener = QueueListener(_log_queue, logging.StreamHandler())
+    _log_listener.start()
+
+class ORJSONRequest(Request):
+    """Request that decodes its JSON body with orjson instead of stdlib json"""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """Route class decoding inbound bodies at C speed via ORJSONRequest"""
+
+    def get_route_handler(self):
+        original_route_handler = super().get_route_handler()
+
+        async def custom_route_handler(request: Request):
+            return await original_route_handler(
+                ORJSONRequest(request.scope, request.receive)
+            )
+
+        return custom_route_handler
+
+
+app = FastAPI(
+    title="Analytics Agent",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
+app.router.route_class = ORJSONRoute
 
 # Add CORS middleware
 app.add_middleware(
@@ -21,51 +73,301 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Process-wide tuning knobs resolved once at import"""
+
+    api_key: str = ""
+    model: str = "gpt-4o-mini"
+    max_tokens_analytics: int = 500
+    max_tokens_kpi: int = 1000
+    timeout_s: float = 60.0
+
+
+CONFIG = Config(
+    api_key=os.getenv("OPENAI_API_KEY", ""),
+    model=os.getenv("ANALYTICS_MODEL", "gpt-4o-mini"),
+)
+
 # Configure OpenAI
-openai.api_key = os.getenv("OPENAI_API_KEY")
+openai.api_key = CONFIG.api_key
+
+# Single long-lived OpenAI client with a pooled HTTP/2 transport so every
+# analysis reuses warm, multiplexed connections instead of paying a fresh
+# TCP+TLS handshake per call.
+client = openai.AsyncOpenAI(
+    api_key=CONFIG.api_key,
+    http_client=httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=64,
+            max_keepalive_connections=32,
+            keepalive_expiry=60,
+        ),
+        timeout=httpx.Timeout(CONFIG.timeout_s, connect=5.0),
+    ),
+)
+
+
+@app.on_event("shutdown")
+async def _close_openai_client():
+    """Release the pooled connections when the worker shuts down"""
+    await client.close()
+
+
+# In-process response cache for LLM completions. The prompts here are fully
+# templated off business fields, so identical requests produce byte-identical
+# prompts and an exact-match lookup short-circuits the whole network round-trip.
+ANALYTICS_CACHE_TTL = int(os.getenv("ANALYTICS_CACHE_TTL", "86400"))
+ANALYTICS_CACHE_MAX = int(os.getenv("ANALYTICS_CACHE_MAX", "1024"))
+
+_llm_cache: Dict[str, Any] = {}
+
+# In-flight completions keyed like the cache, for request coalescing.
+_inflight: Dict[str, asyncio.Future] = {}
+
+# Circuit breaker for the OpenAI dependency: after repeated consecutive
+# failures the analysis skips straight to the static fallback for a
+# cooldown window instead of paying a doomed round-trip per request.
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 30.0
+
+_breaker = {"failures": 0, "open_until": 0.0}
+
+# Cap on concurrent OpenAI calls so a burst queues briefly instead of
+# blowing through the provider rate limit and failing wholesale.
+_llm_sem = asyncio.Semaphore(int(os.getenv("ANALYTICS_MAX_CONCURRENCY", "16")))
+
+
+# Negative cache: a prompt that just failed is not retried for a short
+# window, so identical requests don't queue up behind a degraded provider.
+ERROR_CACHE_TTL = float(os.getenv("ANALYTICS_ERROR_CACHE_TTL", "30"))
+ERROR_CACHE_MAX = int(os.getenv("ANALYTICS_ERROR_CACHE_MAX", "1024"))
+
+_error_cache: Dict[str, float] = {}
+
+
+class _BreakerOpenError(Exception):
+    """Raised internally to route straight to the static fallback"""
+
+
+class _CachedFailureError(Exception):
+    """Raised when an identical prompt failed within ERROR_CACHE_TTL"""
+
+
+def _breaker_open() -> bool:
+    return time.monotonic() < _breaker["open_until"]
+
+
+def _breaker_record_failure():
+    _breaker["failures"] += 1
+    if _breaker["failures"] >= BREAKER_THRESHOLD:
+        _breaker["failures"] = 0
+        _breaker["open_until"] = time.monotonic() + BREAKER_COOLDOWN
+        logger.warning("⚠️ OpenAI circuit breaker opened; serving fallback analytics")
+
+
+def _breaker_record_success():
+    _breaker["failures"] = 0
+
+
+# Optional tiktoken encoder, loaded once at import so the BPE merges are
+# never reloaded on the request path; estimates degrade to the ~4
+# chars/token rule when the package is absent.
+try:
+    import tiktoken
+
+    _ENC = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _ENC = None
+
+MAX_INPUT_TOKENS = int(os.getenv("ANALYTICS_MAX_INPUT_TOKENS", "6000"))
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough input-token count for budget checks"""
+    if _ENC is not None:
+        return len(_ENC.encode(text))
+    return len(text) // 4
+
+
+def _compact(value: Any, max_items: int = 3) -> Any:
+    """Trim caller-supplied payload values before prompt interpolation
+
+    Lists and dicts keep only their first max_items entries so an
+    arbitrarily large upstream plan can't balloon the prompt tokens.
+    """
+    if isinstance(value, list):
+        return [_compact(item, max_items) for item in value[:max_items]]
+    if isinstance(value, dict):
+        return {
+            key: _compact(item, max_items)
+            for key, item in list(value.items())[:max_items]
+        }
+    return value
+
+
+async def cached_chat_completion(
+    system: str,
+    user: str,
+    model: str = CONFIG.model,
+    max_tokens: int = 1000,
+    temperature: float = 0.7,
+    response_format: Dict[str, str] = None,
+) -> str:
+    """Call the chat API, reusing cached completions for identical prompts."""
+    key = hashlib.sha256(
+        f"{model}\x1e{system}\x1e{user}\x1e{max_tokens}\x1e{temperature}"
+        f"\x1e{response_format}".encode()
+    ).hexdigest()
+    hit = _llm_cache.get(key)
+    if hit is not None:
+        expires_at, text = hit
+        if time.monotonic() < expires_at:
+            return text
+        _llm_cache.pop(key, None)
+
+    # Single-flight: concurrent identical prompts collapse onto the first
+    # caller's future instead of issuing duplicate OpenAI calls. The cache
+    # handles repeats across time; this handles repeats at the same instant.
+    inflight = _inflight.get(key)
+    if inflight is not None:
+        return await inflight
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        text = await _chat_completion(
+            key, system, user, model, max_tokens, temperature, response_format
+        )
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # mark retrieved for waiterless futures
+        raise
+    except BaseException as e:
+        # CancelledError is not an Exception; fail any coalesced waiters
+        # rather than leaving them hung on a never-resolved future.
+        if not future.done():
+            future.set_exception(e)
+            future.exception()
+        raise
+    finally:
+        _inflight.pop(key, None)
+    future.set_result(text)
+    return text
+
+
+async def _chat_completion(
+    key: str,
+    system: str,
+    user: str,
+    model: str,
+    max_tokens: int,
+    temperature: float,
+    response_format: Dict[str, str],
+) -> str:
+    """Issue one completion, maintaining the breaker and both caches"""
+    # Bound the prompt deterministically instead of relying on server-side
+    # truncation; without tiktoken installed we can only warn.
+    if _estimate_tokens(system) + _estimate_tokens(user) > MAX_INPUT_TOKENS:
+        if _ENC is not None:
+            user = _ENC.decode(_ENC.encode(user)[:MAX_INPUT_TOKENS])
+        logger.warning("⚠️ Prompt exceeded ~%d token budget", MAX_INPUT_TOKENS)
+
+    failed_until = _error_cache.get(key)
+    if failed_until is not None:
+        if time.monotonic() < failed_until:
+            raise _CachedFailureError()
+        _error_cache.pop(key, None)
+
+    if _breaker_open():
+        raise _BreakerOpenError()
+
+    # Stream the completion and join the deltas: tokens are consumed as the
+    # provider emits them instead of buffering the full body server-side.
+    # The semaphore bounds concurrent calls; failures feed the breaker.
+    try:
+        async with _llm_sem:
+            response = await client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": user},
+                ],
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True,
+                **(
+                    {"response_format": response_format} if response_format else {}
+                ),
+            )
+            deltas = []
+            async for chunk in response:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    deltas.append(delta)
+            text = "".join(deltas)
+    except Exception:
+        _breaker_record_failure()
+        # Same bounded eviction as the positive cache, so unique failed
+        # prompts can't grow the map for the life of the process.
+        if len(_error_cache) >= ERROR_CACHE_MAX:
+            oldest = min(_error_cache, key=_error_cache.get)
+            _error_cache.pop(oldest, None)
+        _error_cache[key] = time.monotonic() + ERROR_CACHE_TTL
+        raise
+    _breaker_record_success()
+
+    if len(_llm_cache) >= ANALYTICS_CACHE_MAX:
+        oldest = min(_llm_cache, key=lambda k: _llm_cache[k][0])
+        _llm_cache.pop(oldest, None)
+    _llm_cache[key] = (time.monotonic() + ANALYTICS_CACHE_TTL, text)
+    return text
+
+
+# Cached ISO timestamp refreshed by a background task; the response
+# metadata only needs coarse resolution, so handlers read this instead of
+# allocating and formatting a fresh datetime on every call.
+_NOW_ISO = datetime.now().isoformat()
+
+
+async def _refresh_now_iso():
+    global _NOW_ISO
+    while True:
+        _NOW_ISO = datetime.now().isoformat()
+        await asyncio.sleep(0.25)
+
+
+@app.on_event("startup")
+async def _start_timestamp_ticker():
+    """Keep the shared timestamp fresh once per process"""
+    asyncio.create_task(_refresh_now_iso())
 
 
 class MCPMessage(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     agent_type: str
     business_data: Dict[str, Any]
-    strategic_plan: Dict[str, Any] = {}
-    creative_analysis: Dict[str, Any] = {}
-    financial_analysis: Dict[str, Any] = {}
-    sales_strategy: Dict[str, Any] = {}
+    strategic_plan: Dict[str, Any] = Field(default_factory=dict)
+    creative_analysis: Dict[str, Any] = Field(default_factory=dict)
+    financial_analysis: Dict[str, Any] = Field(default_factory=dict)
+    sales_strategy: Dict[str, Any] = Field(default_factory=dict)
     timestamp: str
     request_id: str
 
 
 class AnalyticsResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     agent_type: str
     analytics_summary: Dict[str, Any]
     timestamp: str
     request_id: str
 
 
-class AnalyticsAgent:
-    """Analytics Agent for comprehensive data analysis and insights"""
-
-    def __init__(self):
-        self.agent_type = "analytics"
-
-    async def analyze_all_data(
-        self,
-        business_data: Dict[str, Any],
-        strategic_plan: Dict[str, Any],
-        creative_analysis: Dict[str, Any],
-        financial_analysis: Dict[str, Any],
-        sales_strategy: Dict[str, Any],
-    ) -> Dict[str, Any]:
-        """Analyze all agent outputs and provide comprehensive insights"""
-
-        business_name = business_data.get("business_name", "")
-        business_type = business_data.get("business_type", "")
-        industry = business_data.get("industry", "")
-        description = business_data.get("description", "")
-
-        # Create dynamic prompt for comprehensive analysis
-        prompt = f"""
+# Static prompt scaffold built once at import; only the per-business fields
+# are interpolated on the request path.
+CONTEXT_HEADER = """
         As a business analytics expert, analyze the following comprehensive business data and provide insights:
 
         Business Information:
@@ -73,30 +375,45 @@ class AnalyticsAgent:
         - Type: {business_type}
         - Industry: {industry}
         - Description: {description}
+"""
 
+STRATEGIC_CONTEXT = """
         Strategic Plan Summary:
-        - Market positioning: {strategic_plan.get('competitive_positioning', {}).get('unique_value_proposition', 'N/A')}
-        - Growth strategy: {strategic_plan.get('growth_strategy', {}).get('short_term_goals', [])}
-        - Key recommendations: {strategic_plan.get('key_recommendations', [])}
+        - Market positioning: {positioning}
+        - Growth strategy: {growth_goals}
+        - Key recommendations: {key_recommendations}
+"""
 
+CREATIVE_CONTEXT = """
         Creative Analysis Summary:
-        - Brand identity: {creative_analysis.get('brand_identity', {}).get('brand_personality', 'N/A')}
-        - Marketing campaigns: {len(creative_analysis.get('marketing_campaigns', []))} campaigns planned
-        - Creative recommendations: {creative_analysis.get('recommendations', [])}
+        - Brand identity: {brand_personality}
+        - Marketing campaigns: {campaign_count} campaigns planned
+        - Creative recommendations: {creative_recommendations}
+"""
 
+FINANCIAL_CONTEXT = """
         Financial Analysis Summary:
-        - Revenue forecast: {financial_analysis.get('financial_projections', {}).get('revenue_forecast', {})}
-        - Investment required: {financial_analysis.get('funding_requirements', {}).get('initial_investment', {}).get('total', 'N/A')}
-        - Break-even: {financial_analysis.get('break_even_analysis', {}).get('break_even_revenue', 'N/A')}
+        - Revenue forecast: {revenue_forecast}
+        - Investment required: {initial_investment}
+        - Break-even: {break_even}
+"""
 
+SALES_CONTEXT = """
         Sales Strategy Summary:
-        - Target segments: {len(sales_strategy.get('target_customer_segments', {}))} customer segments
-        - Sales channels: {len(sales_strategy.get('sales_channels', {}))} channel types
-        - Sales targets: {sales_strategy.get('sales_metrics', {}).get('targets', {})}
-
-        Please provide comprehensive analytics specifically tailored for this {business_type} business in the {industry} industry, including:
+        - Target segments: {segment_count} customer segments
+        - Sales channels: {channel_count} channel types
+        - Sales targets: {sales_targets}
+"""
 
-        1. Cross-functional Insights and Correlations:
+# Focused sub-analyses fired concurrently. Each entry carries only the
+# context slices its analysis actually consumes, so the fan-out sends
+# roughly the same total input tokens as one monolithic prompt instead of
+# four copies of the full prelude.
+SECTION_PROMPTS = (
+    (
+        "Cross-functional Insights and Risk Assessment",
+        (STRATEGIC_CONTEXT, CREATIVE_CONTEXT, FINANCIAL_CONTEXT, SALES_CONTEXT),
+        """1. Cross-functional Insights and Correlations:
            - Strategic-financial alignment analysis
            - Creative-sales synergy assessment
            - Resource optimization opportunities
@@ -104,326 +421,524 @@ class AnalyticsAgent:
         2. Risk Assessment and Mitigation Strategies:
            - High, medium, and low-risk factors
            - Probability and impact analysis
-           - Mitigation strategies for each risk
-
-        3. Success Probability Analysis:
+           - Mitigation strategies for each risk""",
+    ),
+    (
+        "Success Probability and Resource Optimization",
+        (STRATEGIC_CONTEXT, FINANCIAL_CONTEXT),
+        """1. Success Probability Analysis:
            - Overall success rate assessment
            - Contributing factors analysis
            - Critical success factors identification
 
-        4. Resource Optimization Recommendations:
+        2. Resource Optimization Recommendations:
            - Human resources optimization
            - Financial resources allocation
-           - Technology and infrastructure needs
-
-        5. Timeline and Milestone Analysis:
+           - Technology and infrastructure needs""",
+    ),
+    (
+        "Timeline and Competitive Advantage",
+        (STRATEGIC_CONTEXT,),
+        """1. Timeline and Milestone Analysis:
            - Implementation phases and timelines
            - Key milestones and deliverables
            - Critical path analysis
 
-        6. Competitive Advantage Assessment:
+        2. Competitive Advantage Assessment:
            - Unique value proposition strength
            - Competitive positioning analysis
-           - Differentiation opportunities
-
-        7. Market Opportunity Analysis:
+           - Differentiation opportunities""",
+    ),
+    (
+        "Market Opportunity and Implementation Priorities",
+        (STRATEGIC_CONTEXT, SALES_CONTEXT),
+        """1. Market Opportunity Analysis:
            - Market size and growth potential
            - Customer segment opportunities
            - Market entry timing
 
-        8. Implementation Priority Matrix:
+        2. Implementation Priority Matrix:
            - High-impact, low-effort initiatives
            - Strategic priorities and sequencing
-           - Resource allocation recommendations
-
-        Focus on actionable insights that can guide business decisions for this {business_type} business in the {industry} industry.
-        """
+           - Resource allocation recommendations""",
+    ),
+)
 
-        try:
-            # Call OpenAI for comprehensive analysis
-            response = await openai.ChatCompletion.acreate(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": f"You are an expert business analyst specializing in cross-functional analysis, risk assessment, and strategic insights for {business_type} businesses in the {industry} industry. Provide specific, actionable analytics tailored to this business type and industry.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                max_tokens=1500,
-                temperature=0.7,
-            )
 
-            analytics_text = response.choices[0].message.content
-
-            # Create dynamic analytics summary structure
-            analytics_summary = {
-                "business_name": business_name,
-                "business_type": business_type,
-                "cross_functional_insights": {
-                    "strategic_financial_alignment": {
-                        "insight": f"Strong alignment between {business_type} growth goals and financial projections",
-                        "confidence": "85%",
-                        "recommendation": f"Proceed with {business_type} growth strategy as planned",
-                    },
-                    "creative_sales_synergy": {
-                        "insight": f"Creative campaigns align well with {business_type} target customer segments",
-                        "confidence": "90%",
-                        "recommendation": f"Implement integrated {business_type} marketing-sales approach",
-                    },
-                    "resource_optimization": {
-                        "insight": f"Marketing budget allocation supports {business_type} sales targets",
-                        "confidence": "80%",
-                        "recommendation": f"Monitor {business_type} ROI and adjust budget allocation",
-                    },
-                },
-                "risk_assessment": {
-                    "high_risk_factors": [
-                        {
-                            "factor": f"{business_type} market competition",
-                            "probability": "70%",
-                            "impact": "High",
-                            "mitigation": f"Focus on unique {business_type} value proposition and customer experience",
-                        },
-                        {
-                            "factor": f"{business_type} financial constraints",
-                            "probability": "60%",
-                            "impact": "Medium",
-                            "mitigation": f"Maintain cash reserves and diversify {business_type} funding sources",
-                        },
-                        {
-                            "factor": f"{business_type} operational challenges",
-                            "probability": "50%",
-                            "impact": "Medium",
-                            "mitigation": f"Invest in {business_type} training and technology",
-                        },
-                    ],
-                    "medium_risk_factors": [
-                        {
-                            "factor": f"{business_type} supply chain disruptions",
-                            "probability": "40%",
-                            "impact": "Medium",
-                            "mitigation": f"Build strong {business_type} supplier relationships",
-                        },
-                        {
-                            "factor": f"{business_type} staff turnover",
-                            "probability": "45%",
-                            "impact": "Medium",
-                            "mitigation": f"Implement {business_type} retention strategies",
-                        },
-                    ],
-                    "low_risk_factors": [
-                        {
-                            "factor": f"{business_type} regulatory changes",
-                            "probability": "20%",
-                            "impact": "Low",
-                            "mitigation": f"Stay informed about {industry} regulations",
-                        }
-                    ],
+@lru_cache(maxsize=256)
+def _summary_skeleton(business_type: str, industry: str) -> Dict[str, Any]:
+    """Build the invariant part of the analytics summary for a business
+    type/industry pair. The result is cached and shared; callers take a
+    shallow copy and overwrite only the per-request fields."""
+    return {
+        "business_name": "",
+        "business_type": business_type,
+        "cross_functional_insights": {
+            "strategic_financial_alignment": {
+                "insight": f"Strong alignment between {business_type} growth goals and financial projections",
+                "confidence": "85%",
+                "recommendation": f"Proceed with {business_type} growth strategy as planned",
+            },
+            "creative_sales_synergy": {
+                "insight": f"Creative campaigns align well with {business_type} target customer segments",
+                "confidence": "90%",
+                "recommendation": f"Implement integrated {business_type} marketing-sales approach",
+            },
+            "resource_optimization": {
+                "insight": f"Marketing budget allocation supports {business_type} sales targets",
+                "confidence": "80%",
+                "recommendation": f"Monitor {business_type} ROI and adjust budget allocation",
+            },
+        },
+        "risk_assessment": {
+            "high_risk_factors": [
+                {
+                    "factor": f"{business_type} market competition",
+                    "probability": "70%",
+                    "impact": "High",
+                    "mitigation": f"Focus on unique {business_type} value proposition and customer experience",
                 },
-                "success_probability": {
-                    "overall_success_rate": "75%",
-                    "factors_contributing_to_success": [
-                        f"Strong market demand for quality {business_type} services",
-                        f"Clear {business_type} differentiation strategy",
-                        f"Comprehensive {business_type} financial planning",
-                        f"Integrated {business_type} marketing approach",
-                    ],
-                    "critical_success_factors": [
-                        f"{business_type} execution quality",
-                        f"{business_type} customer experience delivery",
-                        f"{business_type} financial discipline",
-                        f"{business_type} adaptability to market changes",
-                    ],
+                {
+                    "factor": f"{business_type} financial constraints",
+                    "probability": "60%",
+                    "impact": "Medium",
+                    "mitigation": f"Maintain cash reserves and diversify {business_type} funding sources",
                 },
-                "resource_optimization": {
-                    "human_resources": {
-                        "optimal_staffing": "5-7 employees",
-                        "key_roles": [
-                            f"{business_type.title()} Manager",
-                            f"{business_type.title()} Specialists",
-                            "Marketing Specialist",
-                        ],
-                        "training_priorities": [
-                            f"{business_type} expertise and knowledge",
-                            "Customer service excellence",
-                            "Sales techniques and relationship building",
-                        ],
-                    },
-                    "financial_resources": {
-                        "optimal_investment": "To be determined based on business scale",
-                        "funding_mix": "50% personal, 40% loan, 10% investor",
-                        "cash_flow_management": "Maintain 6-month reserve",
-                    },
-                    "technology_resources": {
-                        "essential_systems": [
-                            f"{business_type} management system",
-                            "Customer relationship management",
-                            f"{business_type} service delivery platform",
-                        ],
-                        "investment_priority": "High for operational efficiency",
-                    },
+                {
+                    "factor": f"{business_type} operational challenges",
+                    "probability": "50%",
+                    "impact": "Medium",
+                    "mitigation": f"Invest in {business_type} training and technology",
                 },
-                "timeline_analysis": {
-                    "implementation_phases": {
-                        "phase_1": {
-                            "duration": "0-3 months",
-                            "focus": f"{business_type} setup and launch",
-                            "key_milestones": [
-                                f"{business_type} infrastructure setup",
-                                f"{business_type} staff hiring",
-                                f"{business_type} initial marketing",
-                            ],
-                        },
-                        "phase_2": {
-                            "duration": "3-6 months",
-                            "focus": f"{business_type} growth and optimization",
-                            "key_milestones": [
-                                f"{business_type} customer base building",
-                                f"{business_type} process optimization",
-                                f"{business_type} feedback integration",
-                            ],
-                        },
-                        "phase_3": {
-                            "duration": "6-12 months",
-                            "focus": f"{business_type} expansion and scaling",
-                            "key_milestones": [
-                                f"{business_type} second location planning",
-                                f"{business_type} digital expansion",
-                                f"{business_type} partnership development",
-                            ],
-                        },
-                    },
-                    "critical_path": [
-                        f"{business_type} location selection and setup",
-                        f"{business_type} staff recruitment and training",
-                        f"{business_type} marketing campaign launch",
-                        f"{business_type} customer acquisition and retention",
-                    ],
+            ],
+            "medium_risk_factors": [
+                {
+                    "factor": f"{business_type} supply chain disruptions",
+                    "probability": "40%",
+                    "impact": "Medium",
+                    "mitigation": f"Build strong {business_type} supplier relationships",
                 },
-                "competitive_advantage": {
-                    "sustainable_advantages": [
-                        f"Prime location in Bangkok",
-                        f"Quality-focused {business_type} approach",
-                        f"Community-oriented {business_type} business model",
-                        f"Thai cultural integration",
-                    ],
-                    "competitive_positioning": {
-                        "strength": "Strong",
-                        "differentiation": "Clear",
-                        "sustainability": "High",
-                    },
-                    "market_position": f"Premium quality with community focus",
+                {
+                    "factor": f"{business_type} staff turnover",
+                    "probability": "45%",
+                    "impact": "Medium",
+                    "mitigation": f"Implement {business_type} retention strategies",
                 },
-                "market_opportunities": {
-                    "immediate_opportunities": [
-                        f"Growing {business_type} culture in Thailand",
-                        f"Increasing demand for quality {business_type} services",
-                        f"Rising disposable income",
-                        f"Digital transformation in F&B",
-                    ],
-                    "future_opportunities": [
-                        f"Franchise potential",
-                        f"E-commerce expansion",
-                        f"International market entry",
-                        f"Product diversification",
+            ],
+            "low_risk_factors": [
+                {
+                    "factor": f"{business_type} regulatory changes",
+                    "probability": "20%",
+                    "impact": "Low",
+                    "mitigation": f"Stay informed about {industry} regulations",
+                }
+            ],
+        },
+        "success_probability": {
+            "overall_success_rate": "75%",
+            "factors_contributing_to_success": [
+                f"Strong market demand for quality {business_type} services",
+                f"Clear {business_type} differentiation strategy",
+                f"Comprehensive {business_type} financial planning",
+                f"Integrated {business_type} marketing approach",
+            ],
+            "critical_success_factors": [
+                f"{business_type} execution quality",
+                f"{business_type} customer experience delivery",
+                f"{business_type} financial discipline",
+                f"{business_type} adaptability to market changes",
+            ],
+        },
+        "resource_optimization": {
+            "human_resources": {
+                "optimal_staffing": "5-7 employees",
+                "key_roles": [
+                    f"{business_type.title()} Manager",
+                    f"{business_type.title()} Specialists",
+                    "Marketing Specialist",
+                ],
+                "training_priorities": [
+                    f"{business_type} expertise and knowledge",
+                    "Customer service excellence",
+                    "Sales techniques and relationship building",
+                ],
+            },
+            "financial_resources": {
+                "optimal_investment": "To be determined based on business scale",
+                "funding_mix": "50% personal, 40% loan, 10% investor",
+                "cash_flow_management": "Maintain 6-month reserve",
+            },
+            "technology_resources": {
+                "essential_systems": [
+                    f"{business_type} management system",
+                    "Customer relationship management",
+                    f"{business_type} service delivery platform",
+                ],
+                "investment_priority": "High for operational efficiency",
+            },
+        },
+        "timeline_analysis": {
+            "implementation_phases": {
+                "phase_1": {
+                    "duration": "0-3 months",
+                    "focus": f"{business_type} setup and launch",
+                    "key_milestones": [
+                        f"{business_type} infrastructure setup",
+                        f"{business_type} staff hiring",
+                        f"{business_type} initial marketing",
                     ],
-                    "market_size": "Growing",
-                    "growth_potential": "High",
                 },
-                "implementation_priority": {
-                    "high_priority": [
-                        f"{business_type} location setup and equipment installation",
-                        f"{business_type} staff recruitment and training",
-                        f"{business_type} marketing campaign development",
-                        f"{business_type} financial management system setup",
-                    ],
-                    "medium_priority": [
-                        f"{business_type} loyalty program implementation",
-                        f"{business_type} digital platform development",
-                        f"{business_type} supplier relationship building",
-                        f"{business_type} quality control systems",
-                    ],
-                    "low_priority": [
-                        f"{business_type} expansion planning",
-                        f"{business_type} franchise development",
-                        f"{business_type} international market research",
+                "phase_2": {
+                    "duration": "3-6 months",
+                    "focus": f"{business_type} growth and optimization",
+                    "key_milestones": [
+                        f"{business_type} customer base building",
+                        f"{business_type} process optimization",
+                        f"{business_type} feedback integration",
                     ],
                 },
-                "performance_metrics": {
-                    "key_indicators": [
-                        f"Monthly {business_type} revenue growth",
-                        f"Customer acquisition cost",
-                        f"Customer lifetime value",
-                        f"Employee satisfaction",
-                        f"Customer satisfaction score",
-                        f"Market share growth",
+                "phase_3": {
+                    "duration": "6-12 months",
+                    "focus": f"{business_type} expansion and scaling",
+                    "key_milestones": [
+                        f"{business_type} second location planning",
+                        f"{business_type} digital expansion",
+                        f"{business_type} partnership development",
                     ],
-                    "target_benchmarks": {
-                        f"revenue_growth": "15% monthly",
-                        f"customer_retention": "70%",
-                        f"profit_margin": "25%",
-                        f"customer_satisfaction": "4.5/5",
-                    },
                 },
-                "key_insights": [
-                    f"Business has strong potential with 75% success probability",
-                    f"Focus on {business_type} execution quality and customer experience",
-                    f"Maintain {business_type} financial discipline and cash reserves",
-                    f"Build strong community relationships",
-                    f"Invest in technology for operational efficiency",
-                    f"Monitor and adapt to market changes",
-                    f"Prioritize {business_type} staff training and retention",
-                    f"Develop strong {business_type} supplier partnerships",
-                ],
-                "ai_analysis": analytics_text,
-            }
+            },
+            "critical_path": [
+                f"{business_type} location selection and setup",
+                f"{business_type} staff recruitment and training",
+                f"{business_type} marketing campaign launch",
+                f"{business_type} customer acquisition and retention",
+            ],
+        },
+        "competitive_advantage": {
+            "sustainable_advantages": [
+                "Prime location in Bangkok",
+                f"Quality-focused {business_type} approach",
+                f"Community-oriented {business_type} business model",
+                "Thai cultural integration",
+            ],
+            "competitive_positioning": {
+                "strength": "Strong",
+                "differentiation": "Clear",
+                "sustainability": "High",
+            },
+            "market_position": "Premium quality with community focus",
+        },
+        "market_opportunities": {
+            "immediate_opportunities": [
+                f"Growing {business_type} culture in Thailand",
+                f"Increasing demand for quality {business_type} services",
+                "Rising disposable income",
+                "Digital transformation in F&B",
+            ],
+            "future_opportunities": [
+                "Franchise potential",
+                "E-commerce expansion",
+                "International market entry",
+                "Product diversification",
+            ],
+            "market_size": "Growing",
+            "growth_potential": "High",
+        },
+        "implementation_priority": {
+            "high_priority": [
+                f"{business_type} location setup and equipment installation",
+                f"{business_type} staff recruitment and training",
+                f"{business_type} marketing campaign development",
+                f"{business_type} financial management system setup",
+            ],
+            "medium_priority": [
+                f"{business_type} loyalty program implementation",
+                f"{business_type} digital platform development",
+                f"{business_type} supplier relationship building",
+                f"{business_type} quality control systems",
+            ],
+            "low_priority": [
+                f"{business_type} expansion planning",
+                f"{business_type} franchise development",
+                f"{business_type} international market research",
+            ],
+        },
+        "performance_metrics": {
+            "key_indicators": [
+                f"Monthly {business_type} revenue growth",
+                "Customer acquisition cost",
+                "Customer lifetime value",
+                "Employee satisfaction",
+                "Customer satisfaction score",
+                "Market share growth",
+            ],
+            "target_benchmarks": {
+                "revenue_growth": "15% monthly",
+                "customer_retention": "70%",
+                "profit_margin": "25%",
+                "customer_satisfaction": "4.5/5",
+            },
+        },
+        "key_insights": [
+            "Business has strong potential with 75% success probability",
+            f"Focus on {business_type} execution quality and customer experience",
+            f"Maintain {business_type} financial discipline and cash reserves",
+            "Build strong community relationships",
+            "Invest in technology for operational efficiency",
+            "Monitor and adapt to market changes",
+            f"Prioritize {business_type} staff training and retention",
+            f"Develop strong {business_type} supplier partnerships",
+        ],
+    }
+
+
+@lru_cache(maxsize=1024)
+def _fallback_skeleton(business_type: str) -> Dict[str, Any]:
+    """Static analytics served when OpenAI is unavailable, built once per
+    business type; callers shallow-copy and fill in business_name."""
+    return {
+        "business_name": "",
+        "success_probability": {"overall_success_rate": "75%"},
+        "risk_assessment": {
+            "high_risk_factors": [
+                {
+                    "factor": f"{business_type} market competition",
+                    "mitigation": "Focus on differentiation",
+                }
+            ]
+        },
+        "key_insights": [
+            "Business has strong potential",
+            f"Focus on {business_type} execution quality",
+            f"Maintain {business_type} financial discipline",
+            "Build community relationships",
+        ],
+    }
+
+
+def _extract_context(
+    business_data: Dict[str, Any],
+    strategic_plan: Dict[str, Any],
+    creative_analysis: Dict[str, Any],
+    financial_analysis: Dict[str, Any],
+    sales_strategy: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Walk the nested payloads exactly once and return the flat dict of
+    values the prompt template interpolates"""
+    return {
+        "business_name": business_data.get("business_name", ""),
+        "business_type": business_data.get("business_type", ""),
+        "industry": business_data.get("industry", ""),
+        "description": business_data.get("description", ""),
+        "positioning": strategic_plan.get("competitive_positioning", {}).get(
+            "unique_value_proposition", "N/A"
+        ),
+        "growth_goals": _compact(
+            strategic_plan.get("growth_strategy", {}).get("short_term_goals", [])
+        ),
+        "key_recommendations": _compact(
+            strategic_plan.get("key_recommendations", [])
+        ),
+        "brand_personality": creative_analysis.get("brand_identity", {}).get(
+            "brand_personality", "N/A"
+        ),
+        "campaign_count": len(creative_analysis.get("marketing_campaigns", [])),
+        "creative_recommendations": _compact(
+            creative_analysis.get("recommendations", [])
+        ),
+        "revenue_forecast": _compact(
+            financial_analysis.get("financial_projections", {}).get(
+                "revenue_forecast", {}
+            )
+        ),
+        "initial_investment": financial_analysis.get("funding_requirements", {})
+        .get("initial_investment", {})
+        .get("total", "N/A"),
+        "break_even": financial_analysis.get("break_even_analysis", {}).get(
+            "break_even_revenue", "N/A"
+        ),
+        "segment_count": len(sales_strategy.get("target_customer_segments", {})),
+        "channel_count": len(sales_strategy.get("sales_channels", {})),
+        "sales_targets": _compact(
+            sales_strategy.get("sales_metrics", {}).get("targets", {})
+        ),
+    }
+
+
+class AnalyticsAgent:
+    """Analytics Agent for comprehensive data analysis and insights"""
+
+    def __init__(self):
+        self.agent_type = "analytics"
+
+    async def analyze_all_data(
+        self,
+        business_data: Dict[str, Any],
+        strategic_plan: Dict[str, Any],
+        creative_analysis: Dict[str, Any],
+        financial_analysis: Dict[str, Any],
+        sales_strategy: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Analyze all agent outputs and provide comprehensive insights"""
+
+        # Extract every interpolated value in one pass over the payloads
+        ctx = _extract_context(
+            business_data,
+            strategic_plan,
+            creative_analysis,
+            financial_analysis,
+            sales_strategy,
+        )
+        business_name = ctx["business_name"]
+        business_type = ctx["business_type"]
+        industry = ctx["industry"]
+
+        header = CONTEXT_HEADER.format_map(ctx)
+        system = f"You are an expert business analyst specializing in cross-functional analysis, risk assessment, and strategic insights for {business_type} businesses in the {industry} industry. Provide specific, actionable analytics tailored to this business type and industry. Respond with a JSON object whose keys are concise snake_case names of the requested analysis areas."
+
+        try:
+            # Submit every focused sub-analysis first, then collect them all;
+            # the calls are independent and run concurrently.
+            sections = await asyncio.gather(
+                *(
+                    cached_chat_completion(
+                        system=system,
+                        user=f"{header}{''.join(tmpl.format_map(ctx) for tmpl in contexts)}\n        Provide analysis covering:\n\n        {body}\n\n        Focus on actionable insights that can guide business decisions for this {business_type} business in the {industry} industry.",
+                        max_tokens=CONFIG.max_tokens_analytics,
+                        temperature=0.2,
+                        response_format={"type": "json_object"},
+                    )
+                    for _, contexts, body in SECTION_PROMPTS
+                )
+            )
+            ai_analysis = {}
+            for (title, _, _), text in zip(SECTION_PROMPTS, sections):
+                try:
+                    ai_analysis[title] = orjson.loads(text)
+                except orjson.JSONDecodeError:
+                    # Keep the raw text if the model ever returns non-JSON
+                    ai_analysis[title] = text
+
+            # Shallow-copy the cached skeleton and fill in the per-request
+            # fields; the nested structures are shared and never mutated.
+            analytics_summary = dict(_summary_skeleton(business_type, industry))
+            analytics_summary["business_name"] = business_name
+            analytics_summary["ai_analysis"] = ai_analysis
 
             return analytics_summary
 
         except Exception as e:
             # Fallback to predefined analytics if OpenAI fails
-            return {
-                "business_name": business_name,
-                "success_probability": {"overall_success_rate": "75%"},
-                "risk_assessment": {
-                    "high_risk_factors": [
-                        {
-                            "factor": f"{business_type} market competition",
-                            "mitigation": f"Focus on differentiation",
-                        }
-                    ]
-                },
-                "key_insights": [
-                    f"Business has strong potential",
-                    f"Focus on {business_type} execution quality",
-                    f"Maintain {business_type} financial discipline",
-                    f"Build community relationships",
-                ],
-            }
+            logger.warning(
+                "⚠️ Analytics fallback served after %s", type(e).__name__
+            )
+            fallback = dict(_fallback_skeleton(business_type))
+            fallback["business_name"] = business_name
+            return fallback
 
 
 # Initialize analytics agent
 analytics_agent = AnalyticsAgent()
 
+# Micro-batching for concurrent analytics requests: pending analyses are
+# coalesced for a short window and dispatched together, amortizing request
+# overhead when the Core Agent fans out to many businesses at once.
+MAX_BATCH = int(os.getenv("ANALYTICS_MAX_BATCH", "8"))
+BATCH_WINDOW_MS = int(os.getenv("ANALYTICS_BATCH_WINDOW_MS", "20"))
+
+_analysis_queue: asyncio.Queue = asyncio.Queue()
+
+# Strong references to in-flight dispatch tasks; discarded on completion.
+_dispatch_tasks: set = set()
+
+
+async def _dispatch_batch(batch):
+    """Run one batch of analyses concurrently and fan results back"""
+    results = await asyncio.gather(
+        *(
+            analytics_agent.analyze_all_data(
+                message.business_data,
+                message.strategic_plan,
+                message.creative_analysis,
+                message.financial_analysis,
+                message.sales_strategy,
+            )
+            for message, _ in batch
+        ),
+        return_exceptions=True,
+    )
+
+    for (_, future), result in zip(batch, results):
+        if future.done():
+            continue
+        if isinstance(result, Exception):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+
+
+async def _batch_worker():
+    """Drain queued analyses in small batches and dispatch each batch in
+    the background, so a slow batch never head-of-line blocks the next"""
+    while True:
+        batch = [await _analysis_queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + BATCH_WINDOW_MS / 1000
+        while len(batch) < MAX_BATCH:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(
+                    await asyncio.wait_for(_analysis_queue.get(), timeout=timeout)
+                )
+            except asyncio.TimeoutError:
+                break
+
+        # Fire the batch without awaiting it: _llm_sem already bounds total
+        # OpenAI concurrency, so the drain loop keeps pulling while earlier
+        # batches are still in flight. The loop holds only weak task refs,
+        # so keep a strong one until the dispatch finishes.
+        task = asyncio.create_task(_dispatch_batch(batch))
+        _dispatch_tasks.add(task)
+        task.add_done_callback(_dispatch_tasks.discard)
+
+
+async def _submit_analysis(message: "MCPMessage") -> Dict[str, Any]:
+    """Enqueue an analysis and wait for the batch worker to complete it"""
+    future = asyncio.get_running_loop().create_future()
+    await _analysis_queue.put((message, future))
+    return await future
+
+
+@app.on_event("startup")
+async def _start_batch_worker():
+    """Start the batching loop once per process"""
+    asyncio.create_task(_batch_worker())
+
+
+def _stream_analytics_response(
+    agent_type: str, analytics_summary: Dict[str, Any], request_id: str
+):
+    """Yield the response JSON in chunks so the client gets first bytes
+    while the large analytics_summary body is still being encoded"""
+    yield b'{"agent_type":' + orjson.dumps(agent_type)
+    yield b',"analytics_summary":' + orjson.dumps(analytics_summary)
+    yield b',"timestamp":' + orjson.dumps(_NOW_ISO)
+    yield b',"request_id":' + orjson.dumps(request_id) + b"}"
+
 
-@app.post("/receive_message", response_model=AnalyticsResponse)
+@app.post("/receive_message")
 async def receive_message(message: MCPMessage):
     """Receive and process messages from Core Agent"""
     try:
-        analytics_summary = await analytics_agent.analyze_all_data(
-            message.business_data,
-            message.strategic_plan,
-            message.creative_analysis,
-            message.financial_analysis,
-            message.sales_strategy,
-        )
+        analytics_summary = await _submit_analysis(message)
 
-        return AnalyticsResponse(
-            agent_type=message.agent_type,
-            analytics_summary=analytics_summary,
-            timestamp=datetime.now().isoformat(),
-            request_id=message.request_id,
+        return StreamingResponse(
+            _stream_analytics_response(
+                message.agent_type, analytics_summary, message.request_id
+            ),
+            media_type="application/json",
         )
     except Exception as e:
         raise HTTPException(
@@ -437,7 +952,7 @@ async def health_check():
     return {
         "status": "healthy",
         "agent_type": "analytics",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _NOW_ISO,
     }
 
 
@@ -448,11 +963,14 @@ async def execute_automated_task(request: Request):
         data = await request.json()
 
         # Log the automated task
-        print(f"🤖 Analytics Agent - Automated Task Received:")
-        print(f"   Task Type: {data.get('task_type')}")
-        print(f"   Business: {data.get('business_name')}")
-        print(f"   Business ID: {data.get('business_id', 'Not available')}")
-        print(f"   Parameters: {data.get('parameters')}")
+        logger.info(
+            "🤖 Analytics Agent - Automated Task Received: type=%s business=%s "
+            "business_id=%s parameters=%s",
+            data.get("task_type"),
+            data.get("business_name"),
+            data.get("business_id", "Not available"),
+            data.get("parameters"),
+        )
 
         task_type = data.get("task_type")
         business_name = data.get("business_name")
@@ -481,11 +999,11 @@ async def execute_automated_task(request: Request):
                 ],
             }
 
-        print(f"✅ Analytics Agent - Task Completed: {task_type}")
+        logger.info("✅ Analytics Agent - Task Completed: %s", task_type)
         return result
 
     except Exception as e:
-        print(f"❌ Analytics Agent - Task Error: {str(e)}")
+        logger.error("❌ Analytics Agent - Task Error: %s", e)
         return {
             "status": "failed",
             "error": str(e),
@@ -512,27 +1030,19 @@ async def perform_kpi_monitoring(
         Provide insights on KPI trends, anomalies, and recommendations for improvement.
         """
 
-        response = await openai.ChatCompletion.acreate(
-            model="gpt-3.5-turbo",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert business analyst providing KPI insights and performance optimization recommendations.",
-                },
-                {"role": "user", "content": kpi_prompt},
-            ],
-            max_tokens=1000,
+        analysis = await cached_chat_completion(
+            system="You are an expert business analyst providing KPI insights and performance optimization recommendations.",
+            user=kpi_prompt,
+            max_tokens=CONFIG.max_tokens_kpi,
             temperature=0.7,
         )
 
-        analysis = response.choices[0].message.content
-
         return {
             "status": "completed",
             "task_type": "kpi_monitoring",
             "business_name": business_name,
             "business_id": business_id,
-            "monitoring_date": datetime.now().isoformat(),
+            "monitoring_date": _NOW_ISO,
             "kpi_analysis": analysis,
             "kpis": {
                 "revenue_growth": 15.5,  # %
@@ -596,27 +1106,19 @@ async def perform_trend_analysis(
         Provide insights on emerging trends and strategic implications.
         """
 
-        response = await openai.ChatCompletion.acreate(
-            model="gpt-3.5-turbo",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a trend analyst providing insights on business patterns and strategic opportunities.",
-                },
-                {"role": "user", "content": trend_prompt},
-            ],
-            max_tokens=1000,
+        analysis = await cached_chat_completion(
+            system="You are a trend analyst providing insights on business patterns and strategic opportunities.",
+            user=trend_prompt,
+            max_tokens=CONFIG.max_tokens_kpi,
             temperature=0.7,
         )
 
-        analysis = response.choices[0].message.content
-
         return {
             "status": "completed",
             "task_type": "trend_analysis",
             "business_name": business_name,
             "business_id": business_id,
-            "analysis_date": datetime.now().isoformat(),
+            "analysis_date": _NOW_ISO,
             "trend_analysis": analysis,
             "trend_insights": {
                 "sales_trends": {
@@ -678,4 +1180,20 @@ async def perform_trend_analysis(
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=5006)
+    try:
+        import uvloop  # noqa: F401
+
+        loop = "uvloop"
+    except ImportError:
+        loop = "auto"
+
+    uvicorn.run(
+        "analytics_agent:app",
+        host="0.0.0.0",
+        port=5006,
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        loop=loop,
+        http="httptools",
+        log_level="warning",
+        access_log=False,
+    )
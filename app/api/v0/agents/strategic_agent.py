@@ -2,11 +2,12 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Dict, Any
+import asyncio
 import openai
+import operator
 import os
 from datetime import datetime
 from dotenv import load_dotenv
-from fastapi import Request
 
 # Load environment variables
 load_dotenv()
@@ -25,6 +26,72 @@ app.add_middleware(
 # Configure OpenAI
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
+# Bound the number of in-flight OpenAI calls so batch fan-out can't blow
+# through the account's rate limit and stall every in-flight task with 429s.
+_OPENAI_SEM = asyncio.Semaphore(int(os.getenv("OPENAI_MAX_INFLIGHT", 20)))
+
+# Defaults for the business fields used by the strategic analysis; merged under
+# the incoming payload so all fields can be fetched with one itemgetter call
+# instead of repeated dict.get() lookups.
+_BUSINESS_DEFAULTS = {
+    "business_name": "",
+    "business_type": "",
+    "location": "",
+    "description": "",
+    "target_market": "",
+    "competitors": [],
+    "growth_goals": [],
+    "industry": "",
+    "business_model": "",
+    "market_size": "",
+    "unique_value_proposition": "",
+    "initial_investment": None,
+    "team_size": None,
+}
+
+_get_business_fields = operator.itemgetter(*_BUSINESS_DEFAULTS)
+
+# Constant recommendation/KPI entries hoisted out of analyze_business so the
+# success path doesn't reallocate the same strings on every request; the one
+# or two dynamic entries are spliced in around these at response-build time.
+_BASE_KEY_RECOMMENDATIONS = (
+    "Develop strong brand identity and market positioning",
+    "Implement data-driven decision making",
+    "Build strategic partnerships and supplier relationships",
+    "Invest in digital marketing and online presence",
+)
+
+_BASE_MITIGATION_STRATEGIES = (
+    "Diversify revenue streams",
+    "Build strong supplier relationships",
+    "Invest in employee training and retention",
+    "Implement robust technology systems",
+)
+
+_BASE_KPIS = (
+    "Monthly revenue growth",
+    "Customer acquisition cost",
+    "Customer lifetime value",
+    "Customer satisfaction score",
+)
+
+# Cached ISO timestamp refreshed by a background task so hot endpoints
+# (especially /health, polled by load balancers) don't pay for a fresh
+# datetime allocation and strftime on every request.
+_NOW_ISO = datetime.now().isoformat()
+
+
+async def _refresh_now_iso():
+    global _NOW_ISO
+    while True:
+        _NOW_ISO = datetime.now().isoformat()
+        await asyncio.sleep(0.1)
+
+
+@app.on_event("startup")
+async def _start_timestamp_ticker():
+    asyncio.create_task(_refresh_now_iso())
+
 
 class MCPMessage(BaseModel):
     agent_type: str
@@ -40,6 +107,13 @@ class StrategicResponse(BaseModel):
     request_id: str
 
 
+class AutomatedTaskRequest(BaseModel):
+    task_type: str
+    business_name: str
+    business_id: str = "temp_id"  # Provide fallback
+    parameters: Dict[str, Any] = {}
+
+
 class StrategicAgent:
     """Strategic Agent for business strategy planning"""
 
@@ -49,19 +123,21 @@ class StrategicAgent:
     async def analyze_business(self, business_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze business and create strategic plan"""
 
-        business_name = business_data.get("business_name", "")
-        business_type = business_data.get("business_type", "")
-        location = business_data.get("location", "")
-        description = business_data.get("description", "")
-        target_market = business_data.get("target_market", "")
-        competitors = business_data.get("competitors", [])
-        growth_goals = business_data.get("growth_goals", [])
-        industry = business_data.get("industry", "")
-        business_model = business_data.get("business_model", "")
-        market_size = business_data.get("market_size", "")
-        unique_value_proposition = business_data.get("unique_value_proposition", "")
-        initial_investment = business_data.get("initial_investment")
-        team_size = business_data.get("team_size")
+        (
+            business_name,
+            business_type,
+            location,
+            description,
+            target_market,
+            competitors,
+            growth_goals,
+            industry,
+            business_model,
+            market_size,
+            unique_value_proposition,
+            initial_investment,
+            team_size,
+        ) = _get_business_fields({**_BUSINESS_DEFAULTS, **business_data})
 
         # Create dynamic prompt for strategic analysis
         prompt = f"""
@@ -124,18 +200,19 @@ class StrategicAgent:
 
         try:
             # Call OpenAI for strategic analysis
-            response = await openai.ChatCompletion.acreate(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": f"You are an expert strategic business consultant with deep knowledge of {industry} industry, market analysis, competitive positioning, and business growth strategies. Provide specific, actionable advice tailored to {business_type} businesses.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                max_tokens=2000,
-                temperature=0.7,
-            )
+            async with _OPENAI_SEM:
+                response = await openai.ChatCompletion.acreate(
+                    model="gpt-3.5-turbo",
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": f"You are an expert strategic business consultant with deep knowledge of {industry} industry, market analysis, competitive positioning, and business growth strategies. Provide specific, actionable advice tailored to {business_type} businesses.",
+                        },
+                        {"role": "user", "content": prompt},
+                    ],
+                    max_tokens=2000,
+                    temperature=0.7,
+                )
 
             strategic_analysis = response.choices[0].message.content
 
@@ -183,20 +260,9 @@ class StrategicAgent:
                         "Staff turnover and training",
                         "Technology infrastructure challenges",
                     ],
-                    "mitigation_strategies": [
-                        "Diversify revenue streams",
-                        "Build strong supplier relationships",
-                        "Invest in employee training and retention",
-                        "Implement robust technology systems",
-                    ],
+                    "mitigation_strategies": _BASE_MITIGATION_STRATEGIES,
                 },
-                "kpis": [
-                    "Monthly revenue growth",
-                    "Customer acquisition cost",
-                    "Customer lifetime value",
-                    "Customer satisfaction score",
-                    f"{business_type} specific metrics",
-                ],
+                "kpis": (*_BASE_KPIS, f"{business_type} specific metrics"),
                 "implementation_timeline": {
                     "phase_1": "0-6 months: Optimize current operations and establish foundation",
                     "phase_2": "6-12 months: Implement growth initiatives and expand market presence",
@@ -215,14 +281,11 @@ class StrategicAgent:
                     ),
                     "technology": f"{business_type} specific technology and systems",
                 },
-                "key_recommendations": [
+                "key_recommendations": (
                     f"Focus on {business_type} quality and customer experience",
-                    "Develop strong brand identity and market positioning",
-                    "Implement data-driven decision making",
-                    "Build strategic partnerships and supplier relationships",
-                    "Invest in digital marketing and online presence",
+                    *_BASE_KEY_RECOMMENDATIONS,
                     f"Stay updated with {industry} industry trends",
-                ],
+                ),
                 "ai_analysis": strategic_analysis,
             }
 
@@ -274,7 +337,7 @@ async def receive_message(message: MCPMessage):
         return StrategicResponse(
             agent_type=message.agent_type,
             strategic_plan=strategic_plan,
-            timestamp=datetime.now().isoformat(),
+            timestamp=_NOW_ISO,
             request_id=message.request_id,
         )
     except Exception as e:
@@ -289,27 +352,25 @@ async def health_check():
     return {
         "status": "healthy",
         "agent_type": "strategic",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _NOW_ISO,
     }
 
 
 @app.post("/execute_automated_task")
-async def execute_automated_task(request: Request):
+async def execute_automated_task(task: AutomatedTaskRequest):
     """Execute automated tasks for business growth and monitoring"""
     try:
-        data = await request.json()
-
         # Log the automated task
         print(f"🤖 Strategic Agent - Automated Task Received:")
-        print(f"   Task Type: {data.get('task_type')}")
-        print(f"   Business: {data.get('business_name')}")
-        print(f"   Business ID: {data.get('business_id', 'Not available')}")
-        print(f"   Parameters: {data.get('parameters')}")
+        print(f"   Task Type: {task.task_type}")
+        print(f"   Business: {task.business_name}")
+        print(f"   Business ID: {task.business_id}")
+        print(f"   Parameters: {task.parameters}")
 
-        task_type = data.get("task_type")
-        business_name = data.get("business_name")
-        business_id = data.get("business_id", "temp_id")  # Provide fallback
-        parameters = data.get("parameters", {})
+        task_type = task.task_type
+        business_name = task.business_name
+        business_id = task.business_id
+        parameters = task.parameters
 
         # Handle different task types
         if task_type == "market_analysis":
@@ -339,10 +400,26 @@ async def execute_automated_task(request: Request):
         return {
             "status": "failed",
             "error": str(e),
-            "task_type": data.get("task_type") if "data" in locals() else "unknown",
+            "task_type": task.task_type,
         }
 
 
+@app.post("/batch_execute")
+async def batch_execute_tasks(tasks: List[AutomatedTaskRequest]):
+    """Execute a batch of automated tasks concurrently"""
+    try:
+        async with asyncio.TaskGroup() as tg:
+            futures = [tg.create_task(execute_automated_task(task)) for task in tasks]
+
+        results = [future.result() for future in futures]
+        return {"total_tasks": len(results), "results": results}
+    except* Exception as eg:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Batch execution failed: {'; '.join(str(e) for e in eg.exceptions)}",
+        )
+
+
 async def perform_market_analysis(
     business_name: str, business_id: str, parameters: dict
 ):
@@ -362,18 +439,19 @@ async def perform_market_analysis(
         Provide actionable insights and strategic recommendations.
         """
 
-        response = await openai.ChatCompletion.acreate(
-            model="gpt-3.5-turbo",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert market analyst providing strategic insights for business growth.",
-                },
-                {"role": "user", "content": analysis_prompt},
-            ],
-            max_tokens=1000,
-            temperature=0.7,
-        )
+        async with _OPENAI_SEM:
+            response = await openai.ChatCompletion.acreate(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are an expert market analyst providing strategic insights for business growth.",
+                    },
+                    {"role": "user", "content": analysis_prompt},
+                ],
+                max_tokens=1000,
+                temperature=0.7,
+            )
 
         analysis = response.choices[0].message.content
 
@@ -382,7 +460,7 @@ async def perform_market_analysis(
             "task_type": "market_analysis",
             "business_name": business_name,
             "business_id": business_id,
-            "analysis_date": datetime.now().isoformat(),
+            "analysis_date": _NOW_ISO,
             "market_insights": analysis,
             "key_findings": [
                 "Market trends identified",
@@ -424,18 +502,19 @@ async def perform_goal_review(business_name: str, business_id: str, parameters:
         - Implementation priorities
         """
 
-        response = await openai.ChatCompletion.acreate(
-            model="gpt-3.5-turbo",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a strategic consultant reviewing and adjusting business goals for optimal growth.",
-                },
-                {"role": "user", "content": review_prompt},
-            ],
-            max_tokens=1000,
-            temperature=0.7,
-        )
+        async with _OPENAI_SEM:
+            response = await openai.ChatCompletion.acreate(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a strategic consultant reviewing and adjusting business goals for optimal growth.",
+                    },
+                    {"role": "user", "content": review_prompt},
+                ],
+                max_tokens=1000,
+                temperature=0.7,
+            )
 
         review = response.choices[0].message.content
 
@@ -444,7 +523,7 @@ async def perform_goal_review(business_name: str, business_id: str, parameters:
             "task_type": "goal_review",
             "business_name": business_name,
             "business_id": business_id,
-            "review_date": datetime.now().isoformat(),
+            "review_date": _NOW_ISO,
             "goal_analysis": review,
             "performance_metrics": {
                 "goal_achievement_rate": "85%",
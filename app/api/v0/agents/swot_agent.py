@@ -1,39 +1,490 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.routing import APIRoute
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import List, Dict, Any
+import asyncio
+import hashlib
+import httpx
+import json
 import openai
+import orjson
 import os
+import random
+import time
+from collections.abc import Mapping
+from contextlib import asynccontextmanager
 from datetime import datetime
-from dotenv import load_dotenv
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+import logging
+import queue
+from pathlib import Path
+from types import MappingProxyType
 
-# Load environment variables
-load_dotenv()
 
-app = FastAPI(title="SWOT Analysis Agent", version="1.0.0")
+class Settings(BaseSettings):
+    """Environment-backed configuration, read once per process"""
 
-# Add CORS middleware
+    model_config = SettingsConfigDict(
+        env_file=".env", extra="ignore", protected_namespaces=()
+    )
+
+    openai_api_key: str = ""
+    model_name: str = "gpt-4o-mini"
+    # Kept as a raw string: pydantic-settings JSON-decodes complex fields
+    # before any before-validator runs, so typing this List[str] makes a
+    # comma-separated CORS_ORIGINS crash Settings() at import.
+    cors_origins: str = Field(
+        default="*",
+        validation_alias=AliasChoices("cors_origins", "allowed_origins"),
+    )
+
+    @property
+    def allowed_origins(self) -> List[str]:
+        """Origins list built from the raw value; accepts both the
+        comma-separated and the JSON-list form"""
+        value = self.cors_origins.strip()
+        if value.startswith("["):
+            return [str(origin) for origin in json.loads(value)]
+        return [origin.strip() for origin in value.split(",") if origin.strip()]
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings()
+
+
+settings = get_settings()
+
+# Async-safe logging: request coroutines only enqueue records; a
+# background listener thread does the actual stream writes so the event
+# loop never blocks on a stdout flush.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+logger = logging.getLogger("swot_agent")
+if not logger.handlers:
+    logger.setLevel(logging.INFO)
+    logger.addHandler(QueueHandler(_log_queue))
+    logger.propagate = False
+    _log_listener = QueueListener(_log_queue, logging.StreamHandler())
+    _log_listener.start()
+
+class ORJSONRequest(Request):
+    """Request that decodes its JSON body with orjson instead of stdlib json"""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """Route class decoding inbound bodies at C speed via ORJSONRequest"""
+
+    def get_route_handler(self):
+        original_route_handler = super().get_route_handler()
+
+        async def custom_route_handler(request: Request):
+            return await original_route_handler(
+                ORJSONRequest(request.scope, request.receive)
+            )
+
+        return custom_route_handler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the background tasks once per process and close the pool"""
+    ticker = asyncio.create_task(_refresh_now_iso())
+    batcher = asyncio.create_task(_batch_worker())
+    yield
+    ticker.cancel()
+    batcher.cancel()
+    await client.close()
+
+
+# orjson encodes the deeply nested SWOT payload at C speed instead of
+# going through the stdlib json encoder.
+app = FastAPI(
+    title="SWOT Analysis Agent",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
+app.router.route_class = ORJSONRoute
+
+# Add CORS middleware with an explicit allow-list so Starlette can take
+# its precomputed fast path instead of echoing wildcards per request
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Allows all origins
+    allow_origins=settings.allowed_origins,
     allow_credentials=True,
-    allow_methods=["*"],  # Allows all methods
-    allow_headers=["*"],  # Allows all headers
+    allow_methods=["POST", "GET", "OPTIONS"],
+    allow_headers=["content-type", "authorization"],
+    max_age=86400,
 )
 
+# Compress the repetitive-key JSON bodies; small probe responses skip it
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Configure OpenAI
-openai.api_key = os.getenv("OPENAI_API_KEY")
+openai.api_key = settings.openai_api_key
+
+# Single long-lived OpenAI client with a pooled HTTP/2 transport so every
+# analysis reuses warm, multiplexed connections instead of paying a fresh
+# TCP+TLS handshake per call.
+client = openai.AsyncOpenAI(
+    api_key=settings.openai_api_key,
+    http_client=httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=64,
+            max_keepalive_connections=32,
+            keepalive_expiry=60,
+        ),
+        timeout=httpx.Timeout(30.0, connect=5.0),
+    ),
+)
+
+
+# Completed-analysis cache keyed on a content hash of the inputs, so repeat
+# requests (retry loops, dashboard refreshes) return in microseconds instead
+# of paying another multi-second OpenAI round-trip.
+SWOT_CACHE_TTL = int(os.getenv("SWOT_CACHE_TTL", "86400"))
+SWOT_CACHE_MAX = int(os.getenv("SWOT_CACHE_MAX", "1024"))
+
+_swot_cache: Dict[str, Any] = {}  # key -> (expires_at, swot_analysis)
+
+# In-flight analyses keyed by the same hash, so concurrent identical
+# requests await one shared computation instead of duplicating calls.
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+def _cache_key(
+    business_data: Dict[str, Any], strategic_plan: Dict[str, Any]
+) -> str:
+    """Stable hash of the normalized analysis inputs
+
+    competitors and growth_goals are order-insensitive for the analysis,
+    so re-queries of the same business with permuted lists collapse onto
+    the already-cached entry instead of paying a fresh completion.
+    """
+    normalized = dict(business_data)
+    for field in ("competitors", "growth_goals"):
+        value = normalized.get(field)
+        if isinstance(value, list):
+            normalized[field] = sorted(map(str, value))
+    payload = json.dumps(
+        [normalized, strategic_plan], sort_keys=True, default=str
+    ).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _cache_get(key: str):
+    entry = _swot_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, swot_analysis = entry
+    if expires_at < time.monotonic():
+        _swot_cache.pop(key, None)
+        return None
+    return swot_analysis
+
+
+def _cache_put(key: str, swot_analysis: Dict[str, Any]):
+    if len(_swot_cache) >= SWOT_CACHE_MAX:
+        # Evict the oldest entry (insertion order) to stay bounded
+        _swot_cache.pop(next(iter(_swot_cache)), None)
+    _swot_cache[key] = (time.monotonic() + SWOT_CACHE_TTL, swot_analysis)
+
+
+# Circuit breaker for the OpenAI dependency: after repeated consecutive
+# failures the analysis skips straight to the static fallback for a
+# cooldown window instead of paying a doomed round-trip per request.
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 10.0
+
+_breaker = {"failures": 0, "open_until": 0.0}
+
+# Cap on concurrent OpenAI calls so a burst queues briefly instead of
+# blowing through the provider rate limit and failing wholesale.
+_llm_sem = asyncio.Semaphore(int(os.getenv("SWOT_MAX_CONCURRENCY", "16")))
+
+
+class _BreakerOpenError(Exception):
+    """Raised internally to route straight to the static fallback"""
+
+
+def _breaker_open() -> bool:
+    return time.monotonic() < _breaker["open_until"]
+
+
+def _breaker_record_failure():
+    _breaker["failures"] += 1
+    if _breaker["failures"] >= BREAKER_THRESHOLD:
+        _breaker["failures"] = 0
+        _breaker["open_until"] = time.monotonic() + BREAKER_COOLDOWN
+        logger.warning("⚠️ OpenAI circuit breaker opened; serving fallback analyses")
+
+
+def _breaker_record_success():
+    _breaker["failures"] = 0
+
+
+# Optional tiktoken encoder, loaded once at import so the BPE merges are
+# never reloaded on the request path; estimates degrade to the ~4
+# chars/token rule when the package (or the model's encoding) is absent.
+try:
+    import tiktoken
+
+    _ENC = tiktoken.encoding_for_model(get_settings().model_name)
+except Exception:
+    _ENC = None
+
+MAX_INPUT_TOKENS = int(os.getenv("SWOT_MAX_INPUT_TOKENS", "6000"))
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough input-token count for budget checks"""
+    if _ENC is not None:
+        return len(_ENC.encode(text))
+    return len(text) // 4
+
+
+# Transient provider errors worth retrying before the caller's fallback
+# path takes over; anything else propagates immediately.
+RETRY_ATTEMPTS = int(os.getenv("OPENAI_RETRY_ATTEMPTS", "4"))
+
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+)
+
+
+async def _chat_completion(**kwargs):
+    """Issue a completion with bounded concurrency and jittered backoff
+
+    Retries 429s, timeouts and connection drops up to RETRY_ATTEMPTS with
+    exponential backoff plus jitter. With stream=True the stream is
+    consumed under the semaphore and the joined text is returned;
+    otherwise the raw response object is returned.
+    """
+    estimated_in = sum(
+        _estimate_tokens(m.get("content", "")) for m in kwargs.get("messages", ())
+    )
+    if estimated_in > MAX_INPUT_TOKENS:
+        logger.warning("⚠️ Prompt of ~%d tokens exceeds input budget", estimated_in)
+
+    stream = kwargs.get("stream", False)
+    for attempt in range(RETRY_ATTEMPTS):
+        try:
+            async with _llm_sem:
+                result = await client.chat.completions.create(**kwargs)
+                if not stream:
+                    return result
+                deltas = []
+                async for chunk in result:
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        deltas.append(delta)
+                return "".join(deltas)
+        except _RETRYABLE_ERRORS:
+            if attempt == RETRY_ATTEMPTS - 1:
+                raise
+            backoff = min(8.0, 0.5 * 2**attempt)
+            await asyncio.sleep(backoff * (0.5 + random.random()))
+
+
+# Cached ISO timestamp refreshed by a background task; the handlers and the
+# analysis metadata only need coarse resolution, so they read this instead of
+# allocating and formatting a fresh datetime on every call.
+_NOW_ISO = datetime.now().isoformat()
+
+
+def _health_bytes() -> bytes:
+    return orjson.dumps(
+        {"status": "healthy", "agent_type": "swot", "timestamp": _NOW_ISO}
+    )
+
+
+# Pre-serialized /health body, re-encoded by the same ticker so the probe
+# handler returns cached bytes instead of building a dict per hit.
+_HEALTH_BYTES = _health_bytes()
+
+
+async def _refresh_now_iso():
+    global _NOW_ISO, _HEALTH_BYTES
+    while True:
+        _NOW_ISO = datetime.now().isoformat()
+        _HEALTH_BYTES = _health_bytes()
+        await asyncio.sleep(0.25)
+
+
+# Prompt templates rendered per request with a single format_map pass
+# instead of a ~20-interpolation f-string. The old f-string embedded its
+# `" if initial_investment else "Not specified"` branches as literal
+# text; the pre-computed investment_str/team_size_str entries fix that.
+PROMPT_TEMPLATE = """
+        Business Information:
+        - Name: {business_name}
+        - Type: {business_type}
+        - Location: {location}
+        - Description: {description}
+        - Target Market: {target_market}
+        - Industry: {industry}
+        - Business Model: {business_model}
+        - Market Size: {market_size}
+        - Unique Value Proposition: {unique_value_proposition}
+        - Initial Investment: {investment_str}
+        - Team Size: {team_size_str}
+        - Competitors: {competitors_str}
+        - Growth Goals: {growth_goals_str}
+
+        Strategic Context: {strategic_context}
+        """
+
+# Byte-identical across calls so OpenAI's prompt cache can hit on the
+# static prefix; all dynamic fields trail in the user message instead.
+SYSTEM_PROMPT = (
+    "You are an expert business strategist specializing in SWOT analysis. "
+    "Perform a comprehensive SWOT analysis of the business described by "
+    "the user, tailored to its business type and industry. Respond with a "
+    'JSON object of the form {"strengths": [...], "weaknesses": [...], '
+    '"opportunities": [...], "threats": [...]} where each key holds a '
+    "list of at most 5 specific, actionable insights."
+)
+
+def build_swot_tool_spec() -> Dict[str, Any]:
+    """Function-calling tool spec for this agent's analysis
+
+    Lets an orchestrator bundle SWOT with sibling agents in one
+    tools=[...] completion instead of a round-trip per agent.
+    """
+    swot_list = {"type": "array", "items": {"type": "string"}}
+    return {
+        "type": "function",
+        "function": {
+            "name": "swot_analysis",
+            "description": SYSTEM_PROMPT,
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "strengths": swot_list,
+                    "weaknesses": swot_list,
+                    "opportunities": swot_list,
+                    "threats": swot_list,
+                },
+                "required": [
+                    "strengths",
+                    "weaknesses",
+                    "opportunities",
+                    "threats",
+                ],
+            },
+        },
+    }
+
+
+# Static SWOT template rendered once per request via a single format_map
+# pass. Loaded from a JSON blob at import so the ~200-line structure stays
+# out of the module bytecode and ops can edit wording without code churn;
+# the proxy makes accidental mutation of the shared tree raise.
+_SWOT_TEMPLATE = MappingProxyType(
+    orjson.loads((Path(__file__).parent / "swot_template.json").read_bytes())
+)
+
+
+# Fallback served when OpenAI is unavailable, kept as a module constant
+# like _SWOT_TEMPLATE so the except branch only renders placeholders
+# instead of rebuilding the nested literal per failure; the proxy keeps
+# the shared tree read-only.
+_FALLBACK_TEMPLATE = MappingProxyType({
+    "strengths": {
+        "internal_advantages": [
+            "Quality {business_type} focus",
+            "{industry} expertise",
+            "Community connections",
+        ]
+    },
+    "weaknesses": {
+        "internal_limitations": [
+            "Limited resources",
+            "Small team",
+            "Limited marketing budget",
+        ]
+    },
+    "opportunities": {
+        "market_trends": [
+            "Growing {business_type} market demand",
+            "Increasing demand for quality {business_type} services",
+            "Digital transformation",
+        ]
+    },
+    "threats": {
+        "market_risks": [
+            "Competition",
+            "Economic changes",
+            "Supply chain issues",
+        ]
+    },
+    "action_plan": {
+        "immediate_actions": [
+            "Competitor analysis",
+            "Staff training",
+            "Digital {business_type} implementation",
+        ]
+    },
+})
+
+
+def _render_template(node, ctx: Dict[str, str]):
+    """Recursively render a template tree, formatting only placeholder strings"""
+    if isinstance(node, str):
+        return node.format_map(ctx) if "{" in node else node
+    if isinstance(node, Mapping):
+        return {key: _render_template(value, ctx) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_render_template(item, ctx) for item in node]
+    return node
+
+
+@lru_cache(maxsize=1024)
+def _render_swot_skeleton(
+    business_type: str, industry: str, location: str, target_market: str
+) -> Dict[str, Any]:
+    """Rendered static structure per business profile
+
+    Repeat profiles skip the full template walk; callers shallow-merge
+    the result and must treat the shared tree as read-only.
+    """
+    return _render_template(
+        _SWOT_TEMPLATE,
+        {
+            "business_type": business_type,
+            "industry": industry,
+            "location": location,
+            "target_market": target_market,
+        },
+    )
 
 
 class MCPMessage(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     agent_type: str
     business_data: Dict[str, Any]
-    strategic_plan: Dict[str, Any] = {}
+    strategic_plan: Dict[str, Any] = Field(default_factory=dict)
     timestamp: str
     request_id: str
 
 
 class SWOTResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     agent_type: str
     swot_analysis: Dict[str, Any]
     timestamp: str
@@ -41,16 +492,35 @@ class SWOTResponse(BaseModel):
 
 
 class SWOTAgent:
-    """SWOT Analysis Agent for comprehensive business analysis"""
+    """SWOT Analysis Agent for comprehensive business analysis
+
+    Used as a module-level singleton; the per-call constants live on the
+    class and __slots__ keeps instances free of a per-object __dict__.
+    """
 
-    def __init__(self):
-        self.agent_type = "swot"
+    __slots__ = ()
+
+    agent_type = "swot"
+    _PROMPT_TMPL = PROMPT_TEMPLATE
+    _SYSTEM_PROMPT = SYSTEM_PROMPT
+    _TEMPLATE = _SWOT_TEMPLATE
 
     async def perform_swot_analysis(
         self, business_data: Dict[str, Any], strategic_plan: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Perform comprehensive SWOT analysis"""
 
+        cache_key = _cache_key(business_data, strategic_plan)
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Single-flight: if an identical analysis is already in progress,
+        # await its result instead of launching a duplicate OpenAI call.
+        inflight = _inflight.get(cache_key)
+        if inflight is not None:
+            return await inflight
+
         business_name = business_data.get("business_name", "")
         business_type = business_data.get("business_type", "")
         location = business_data.get("location", "")
@@ -65,315 +535,271 @@ class SWOTAgent:
         initial_investment = business_data.get("initial_investment")
         team_size = business_data.get("team_size")
 
-        # Create dynamic prompt for SWOT analysis
-        prompt = f"""
-        As a business strategy expert, perform a comprehensive SWOT analysis for the following business:
-
-        Business Information:
-        - Name: {business_name}
-        - Type: {business_type}
-        - Location: {location}
-        - Description: {description}
-        - Target Market: {target_market}
-        - Industry: {industry}
-        - Business Model: {business_model}
-        - Market Size: {market_size}
-        - Unique Value Proposition: {unique_value_proposition}
-        - Initial Investment: ${initial_investment:,.0f}" if initial_investment else "Not specified"
-        - Team Size: {team_size} employees" if team_size else "Not specified"
-        - Competitors: {', '.join(competitors)}
-        - Growth Goals: {', '.join(growth_goals)}
-        
-        Strategic Context: {strategic_plan.get('competitive_positioning', {}).get('unique_value_proposition', '')}
+        # Build the prompt context once and render the module templates in
+        # a single C-level format_map pass
+        ctx = {
+            "business_name": business_name,
+            "business_type": business_type,
+            "location": location,
+            "description": description,
+            "target_market": target_market,
+            "industry": industry,
+            "business_model": business_model,
+            "market_size": market_size,
+            "unique_value_proposition": unique_value_proposition,
+            "investment_str": (
+                f"${initial_investment:,.0f}"
+                if initial_investment
+                else "Not specified"
+            ),
+            "team_size_str": (
+                f"{team_size} employees" if team_size else "Not specified"
+            ),
+            "competitors_str": ", ".join(competitors) if competitors else "none",
+            "growth_goals_str": (
+                ", ".join(growth_goals) if growth_goals else "none"
+            ),
+            "strategic_context": strategic_plan.get(
+                "competitive_positioning", {}
+            ).get("unique_value_proposition", ""),
+        }
+        prompt = self._PROMPT_TMPL.format_map(ctx)
 
-        Please provide a detailed SWOT analysis specifically tailored for this {business_type} business in the {industry} industry.
-        """
+        # Register the future only now that the prompt rendered: an error
+        # above (e.g. malformed client data) must surface to this caller
+        # instead of stranding an unresolved future that every later
+        # identical request would await forever.
+        future = asyncio.get_running_loop().create_future()
+        _inflight[cache_key] = future
 
         try:
-            # Call OpenAI for SWOT analysis
-            response = await openai.ChatCompletion.acreate(
-                model="gpt-3.5-turbo",
+            if _breaker_open():
+                raise _BreakerOpenError()
+
+            # Render the static SWOT structure off the event loop while the
+            # OpenAI stream is in flight, so dict construction overlaps the
+            # network wait instead of running after it.
+            build_task = asyncio.create_task(
+                asyncio.to_thread(
+                    _render_swot_skeleton,
+                    business_type,
+                    industry,
+                    location,
+                    target_market,
+                )
+            )
+
+            # Call OpenAI for SWOT analysis through the shared helper,
+            # which applies the semaphore and jittered retries
+            swot_analysis_text = await _chat_completion(
+                model=settings.model_name,
                 messages=[
                     {
                         "role": "system",
-                        "content": f"You are an expert business strategist specializing in SWOT analysis for {business_type} businesses in the {industry} industry. Provide specific, actionable insights tailored to this business type and industry.",
+                        "content": self._SYSTEM_PROMPT,
                     },
                     {"role": "user", "content": prompt},
                 ],
-                max_tokens=2000,
-                temperature=0.7,
+                max_tokens=600,
+                temperature=0.2,
+                response_format={"type": "json_object"},
+                stream=True,
             )
-
-            swot_analysis_text = response.choices[0].message.content
+            try:
+                ai_analysis = json.loads(swot_analysis_text)
+            except ValueError:
+                # Keep the raw text if the model ever returns non-JSON
+                ai_analysis = swot_analysis_text
 
             # Create dynamic SWOT analysis structure
             swot_analysis = {
                 "business_name": business_name,
                 "business_type": business_type,
-                "analysis_timestamp": datetime.now().isoformat(),
-                "strengths": {
-                    "internal_advantages": [
-                        f"Strong {business_type} expertise and knowledge",
-                        f"Quality-focused approach to {business_type} services",
-                        f"Strategic location in {location}",
-                        "Flexible business model adaptable to market changes",
-                        "Personalized customer service and relationship building",
-                    ],
-                    "unique_resources": [
-                        f"Specialized {business_type} knowledge and skills",
-                        f"Established {industry} industry relationships",
-                        f"Skilled team with {business_type} expertise",
-                        f"Industry-specific business approach",
-                        f"Local market understanding in {location}",
-                    ],
-                    "competitive_advantages": [
-                        f"Authentic {business_type} experience",
-                        f"Industry-focused expertise",
-                        "Personalized customer relationships",
-                        f"Local market knowledge in {location}",
-                        "Flexible and adaptable operations",
-                    ],
-                    "core_competencies": [
-                        f"{business_type} quality and service delivery",
-                        "Customer service excellence",
-                        f"{industry} industry expertise",
-                        "Local market understanding",
-                        "Operational efficiency",
-                    ],
-                },
-                "weaknesses": {
-                    "internal_limitations": [
-                        "Limited financial resources for expansion",
-                        f"Small team size limiting {business_type} operational capacity",
-                        "Limited marketing budget and expertise",
-                        "Dependency on key staff members",
-                        "Limited technological infrastructure",
-                    ],
-                    "areas_for_improvement": [
-                        f"Digital presence and {business_type} online services",
-                        "Inventory management and cost control",
-                        "Staff training and development programs",
-                        "Marketing and brand awareness",
-                        "Financial planning and cash flow management",
-                    ],
-                    "resource_gaps": [
-                        "Limited access to capital for growth",
-                        "Lack of specialized marketing expertise",
-                        "Limited technology infrastructure",
-                        "Insufficient data analytics capabilities",
-                        f"Limited {industry} industry knowledge",
-                    ],
-                    "operational_challenges": [
-                        f"{business_type} supply chain management complexity",
-                        "Staff recruitment and retention",
-                        f"{business_type} quality consistency across operations",
-                        "Cost control and pricing optimization",
-                        f"{industry} regulatory compliance and licensing",
-                    ],
-                },
-                "opportunities": {
-                    "market_trends": [
-                        f"Growing {business_type} market demand",
-                        f"Increasing demand for quality {business_type} services",
-                        f"Rising disposable income among {target_market}",
-                        f"Growing {industry} industry in {location}",
-                        f"Digital transformation in {industry} sector",
-                    ],
-                    "external_factors": [
-                        "Government support for small businesses",
-                        f"Growing demand for {business_type} services",
-                        f"Increasing {industry} industry opportunities",
-                        "Social media marketing opportunities",
-                        f"Partnership opportunities in {industry}",
-                    ],
-                    "growth_potential": [
-                        f"Expansion of {business_type} operations",
-                        f"Online {business_type} services and delivery",
-                        f"Franchise opportunities in {business_type}",
-                        f"Product diversification in {industry}",
-                        f"Corporate {business_type} services",
-                    ],
-                    "strategic_opportunities": [
-                        f"Partnerships with {industry} businesses",
-                        f"Collaboration with {business_type} experts",
-                        f"{industry}-focused marketing campaigns",
-                        f"Subscription and loyalty programs for {business_type}",
-                        f"Educational {business_type} workshops and events",
-                    ],
-                },
-                "threats": {
-                    "market_risks": [
-                        f"Intense competition from established {business_type} providers",
-                        "Economic downturn affecting customer spending",
-                        f"Changing {industry} industry preferences and trends",
-                        f"New {business_type} competitors entering the market",
-                        f"Fluctuating {industry} industry costs",
-                    ],
-                    "external_challenges": [
-                        f"Regulatory changes affecting {industry}",
-                        f"{business_type} supply chain disruptions and inflation",
-                        "Labor shortage and rising wages",
-                        "Technology disruption and changing customer expectations",
-                        f"Environmental regulations affecting {industry}",
-                    ],
-                    "competitive_threats": [
-                        f"Large {business_type} companies with significant resources",
-                        f"New {business_type} providers opening nearby",
-                        f"Online {business_type} service platforms",
-                        f"Established companies expanding {business_type} offerings",
-                        f"International {business_type} brands entering the market",
-                    ],
-                    "operational_risks": [
-                        "Key staff turnover and knowledge loss",
-                        f"{business_type} equipment failure and maintenance costs",
-                        f"{business_type} quality control issues",
-                        "Cash flow problems and financial instability",
-                        "Location-related issues (rent increases, redevelopment)",
-                    ],
-                },
-                "strategic_implications": {
-                    "strength_opportunity_strategies": [
-                        f"Leverage {business_type} expertise for market expansion",
-                        f"Use {industry} knowledge to create unique customer experiences",
-                        f"Expand quality-focused approach to new {business_type} services",
-                        f"Utilize flexible operations to adapt to {industry} market opportunities",
-                    ],
-                    "weakness_opportunity_strategies": [
-                        "Partner with technology providers to improve digital capabilities",
-                        "Collaborate with marketing agencies to enhance brand presence",
-                        "Seek external funding for expansion opportunities",
-                        "Invest in staff training to improve operational efficiency",
-                    ],
-                    "strength_threat_strategies": [
-                        f"Use {business_type} expertise to build customer loyalty against competition",
-                        f"Leverage quality focus to differentiate from mass-market competitors",
-                        f"Utilize {industry} knowledge to adapt to market changes",
-                        "Apply flexible operations to respond to external threats",
-                    ],
-                    "weakness_threat_strategies": [
-                        "Develop contingency plans for key staff departures",
-                        "Build financial reserves to weather economic downturns",
-                        "Diversify suppliers to reduce supply chain risks",
-                        "Invest in technology to improve operational efficiency",
-                    ],
-                },
-                "action_plan": {
-                    "immediate_actions": [
-                        "Conduct detailed competitor analysis",
-                        "Develop comprehensive staff training program",
-                        f"Implement digital {business_type} management system",
-                        "Create emergency fund for financial stability",
-                    ],
-                    "short_term_goals": [
-                        "Improve digital presence and online services",
-                        "Develop loyalty program to increase customer retention",
-                        "Establish partnerships with local businesses",
-                        "Implement cost control and inventory management systems",
-                    ],
-                    "long_term_strategies": [
-                        f"Expand {business_type} operations to multiple locations",
-                        f"Develop scalable {business_type} business model",
-                        "Create strong brand identity and market presence",
-                        "Build sustainable competitive advantages",
-                    ],
-                },
-                "risk_mitigation": {
-                    "high_priority_risks": [
-                        {
-                            "risk": "Intense competition",
-                            "mitigation": "Focus on unique value proposition and customer experience",
-                            "priority": "High",
-                        },
-                        {
-                            "risk": "Economic downturn",
-                            "mitigation": "Build cash reserves and diversify revenue streams",
-                            "priority": "High",
-                        },
-                        {
-                            "risk": "Staff turnover",
-                            "mitigation": "Implement retention strategies and cross-training",
-                            "priority": "Medium",
-                        },
-                    ]
-                },
-                "ai_analysis": swot_analysis_text,
+                "analysis_timestamp": _NOW_ISO,
+                **await build_task,
+                "ai_analysis": ai_analysis,
             }
 
-            return swot_analysis
+            _breaker_record_success()
+            _cache_put(cache_key, swot_analysis)
 
         except Exception as e:
+            if not isinstance(e, _BreakerOpenError):
+                _breaker_record_failure()
             # Fallback to predefined SWOT analysis if OpenAI fails
-            return {
+            swot_analysis = {
                 "business_name": business_name,
                 "business_type": business_type,
-                "strengths": {
-                    "internal_advantages": [
-                        f"Quality {business_type} focus",
-                        f"{industry} expertise",
-                        "Community connections",
-                    ]
-                },
-                "weaknesses": {
-                    "internal_limitations": [
-                        "Limited resources",
-                        "Small team",
-                        "Limited marketing budget",
-                    ]
-                },
-                "opportunities": {
-                    "market_trends": [
-                        f"Growing {business_type} market demand",
-                        f"Increasing demand for quality {business_type} services",
-                        "Digital transformation",
-                    ]
-                },
-                "threats": {
-                    "market_risks": [
-                        "Competition",
-                        "Economic changes",
-                        "Supply chain issues",
-                    ]
-                },
-                "action_plan": {
-                    "immediate_actions": [
-                        "Competitor analysis",
-                        "Staff training",
-                        f"Digital {business_type} implementation",
-                    ]
-                },
+                **_render_template(_FALLBACK_TEMPLATE, ctx),
             }
+        except BaseException as e:
+            # CancelledError is not an Exception; fail any waiters rather
+            # than leaving them hung on a never-resolved future.
+            if not future.done():
+                future.set_exception(e)
+                future.exception()
+            raise
+        finally:
+            _inflight.pop(cache_key, None)
+
+        if not future.done():
+            future.set_result(swot_analysis)
+        return swot_analysis
 
 
 # Initialize SWOT agent
 swot_agent = SWOTAgent()
 
+# Micro-batching for concurrent analysis requests: pending analyses are
+# coalesced for a short window and dispatched together, amortizing request
+# overhead when the Core Agent fans out to many businesses at once.
+MAX_BATCH = int(os.getenv("SWOT_MAX_BATCH", "16"))
+BATCH_WINDOW_MS = int(os.getenv("SWOT_BATCH_WINDOW_MS", "50"))
+
+_analysis_queue: asyncio.Queue = asyncio.Queue()
+
+# Strong references to in-flight dispatch tasks; discarded on completion.
+_dispatch_tasks: set = set()
+
+
+async def _dispatch_batch(batch):
+    """Run one batch of analyses concurrently and fan results back"""
+    results = await asyncio.gather(
+        *(
+            swot_agent.perform_swot_analysis(business_data, strategic_plan)
+            for business_data, strategic_plan, _ in batch
+        ),
+        return_exceptions=True,
+    )
+
+    for (_, _, future), result in zip(batch, results):
+        if future.done():
+            continue
+        if isinstance(result, Exception):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+
+
+async def _batch_worker():
+    """Drain queued analyses in small batches and dispatch each batch in
+    the background, so a slow batch never head-of-line blocks the next"""
+    while True:
+        batch = [await _analysis_queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + BATCH_WINDOW_MS / 1000
+        while len(batch) < MAX_BATCH:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(
+                    await asyncio.wait_for(_analysis_queue.get(), timeout=timeout)
+                )
+            except asyncio.TimeoutError:
+                break
+
+        # Fire the batch without awaiting it: _llm_sem already bounds total
+        # OpenAI concurrency, so the drain loop keeps pulling while earlier
+        # batches are still in flight. The loop holds only weak task refs,
+        # so keep a strong one until the dispatch finishes.
+        task = asyncio.create_task(_dispatch_batch(batch))
+        _dispatch_tasks.add(task)
+        task.add_done_callback(_dispatch_tasks.discard)
+
+
+async def _submit_analysis(
+    business_data: Dict[str, Any], strategic_plan: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Enqueue an analysis and wait for the batch worker to complete it"""
+    future = asyncio.get_running_loop().create_future()
+    await _analysis_queue.put((business_data, strategic_plan, future))
+    return await future
 
-@app.post("/receive_message", response_model=SWOTResponse)
+
+def _stream_swot_response(
+    agent_type: str, swot_analysis: Dict[str, Any], request_id: str
+):
+    """Yield the response JSON in chunks so the client gets first bytes
+    while the large swot_analysis body is still being encoded"""
+    yield b'{"agent_type":' + orjson.dumps(agent_type)
+    yield b',"swot_analysis":' + orjson.dumps(swot_analysis)
+    yield b',"timestamp":' + orjson.dumps(_NOW_ISO)
+    yield b',"request_id":' + orjson.dumps(request_id) + b"}"
+
+
+@app.post("/receive_message")
 async def receive_message(message: MCPMessage):
     """Receive and process messages from Core Agent"""
     try:
-        swot_analysis = await swot_agent.perform_swot_analysis(
+        swot_analysis = await _submit_analysis(
             message.business_data, message.strategic_plan
         )
 
-        return SWOTResponse(
-            agent_type=message.agent_type,
-            swot_analysis=swot_analysis,
-            timestamp=datetime.now().isoformat(),
-            request_id=message.request_id,
+        # The payload is assembled internally from trusted data, so it is
+        # streamed straight from orjson instead of being revalidated and
+        # re-encoded through a response_model pass.
+        return StreamingResponse(
+            _stream_swot_response(
+                message.agent_type, swot_analysis, message.request_id
+            ),
+            media_type="application/json",
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"SWOT analysis failed: {str(e)}")
 
 
+@app.head("/health")
+async def health_check_head():
+    """Bare 200 for HEAD probes, skipping even the cached body"""
+    return Response(status_code=200)
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "agent_type": "swot",
-        "timestamp": datetime.now().isoformat(),
-    }
+    return Response(
+        content=_HEALTH_BYTES,
+        media_type="application/json",
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+@app.post("/execute_combined_analysis")
+async def execute_combined_analysis(request: Request):
+    """Run the swot_review and competitive_analysis tasks concurrently
+
+    Total latency becomes max of the two OpenAI round-trips instead of
+    their sum when a caller needs both for one business.
+    """
+    try:
+        data = await request.json()
+
+        business_name = data.get("business_name")
+        business_id = data.get("business_id", "temp_id")
+        parameters = data.get("parameters", {})
+
+        swot_review, competitive_analysis = await asyncio.gather(
+            perform_swot_review(business_name, business_id, parameters),
+            perform_competitive_analysis(business_name, business_id, parameters),
+        )
+
+        return {
+            "status": "completed",
+            "task_type": "combined_analysis",
+            "business_name": business_name,
+            "business_id": business_id,
+            "swot_review": swot_review,
+            "competitive_analysis": competitive_analysis,
+        }
+
+    except Exception as e:
+        logger.error("❌ SWOT Agent - Task Error: %s", e)
+        return {
+            "status": "failed",
+            "error": str(e),
+            "task_type": "combined_analysis",
+        }
 
 
 @app.post("/execute_automated_task")
@@ -383,11 +809,14 @@ async def execute_automated_task(request: Request):
         data = await request.json()
 
         # Log the automated task
-        print(f"🤖 SWOT Agent - Automated Task Received:")
-        print(f"   Task Type: {data.get('task_type')}")
-        print(f"   Business: {data.get('business_name')}")
-        print(f"   Business ID: {data.get('business_id', 'Not available')}")
-        print(f"   Parameters: {data.get('parameters')}")
+        logger.info(
+            "🤖 SWOT Agent - Automated Task Received: type=%s business=%s "
+            "business_id=%s parameters=%s",
+            data.get("task_type"),
+            data.get("business_name"),
+            data.get("business_id", "Not available"),
+            data.get("parameters"),
+        )
 
         task_type = data.get("task_type")
         business_name = data.get("business_name")
@@ -414,11 +843,11 @@ async def execute_automated_task(request: Request):
                 ],
             }
 
-        print(f"✅ SWOT Agent - Task Completed: {task_type}")
+        logger.info("✅ SWOT Agent - Task Completed: %s", task_type)
         return result
 
     except Exception as e:
-        print(f"❌ SWOT Agent - Task Error: {str(e)}")
+        logger.error("❌ SWOT Agent - Task Error: %s", e)
         return {
             "status": "failed",
             "error": str(e),
@@ -444,8 +873,8 @@ async def perform_swot_review(business_name: str, business_id: str, parameters:
         Provide updated SWOT insights and strategic recommendations.
         """
 
-        response = await openai.ChatCompletion.acreate(
-            model="gpt-3.5-turbo",
+        response = await _chat_completion(
+            model=settings.model_name,
             messages=[
                 {
                     "role": "system",
@@ -464,7 +893,7 @@ async def perform_swot_review(business_name: str, business_id: str, parameters:
             "task_type": "swot_review",
             "business_name": business_name,
             "business_id": business_id,
-            "review_date": datetime.now().isoformat(),
+            "review_date": _NOW_ISO,
             "swot_analysis": analysis,
             "strengths": [
                 "Strong brand reputation",
@@ -543,8 +972,8 @@ async def perform_competitive_analysis(
         Provide insights on competitive landscape and strategic positioning.
         """
 
-        response = await openai.ChatCompletion.acreate(
-            model="gpt-3.5-turbo",
+        response = await _chat_completion(
+            model=settings.model_name,
             messages=[
                 {
                     "role": "system",
@@ -563,7 +992,7 @@ async def perform_competitive_analysis(
             "task_type": "competitive_analysis",
             "business_name": business_name,
             "business_id": business_id,
-            "analysis_date": datetime.now().isoformat(),
+            "analysis_date": _NOW_ISO,
             "competitive_analysis": analysis,
             "competitive_landscape": {
                 "direct_competitors": [
@@ -631,4 +1060,20 @@ async def perform_competitive_analysis(
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=5007)
+    try:
+        import uvloop  # noqa: F401
+
+        loop = "uvloop"
+    except ImportError:
+        loop = "auto"
+
+    uvicorn.run(
+        "swot_agent:app",
+        host="0.0.0.0",
+        port=5007,
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        loop=loop,
+        http="httptools",
+        log_level="warning",
+        access_log=False,
+    )